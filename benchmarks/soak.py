@@ -0,0 +1,381 @@
+"""
+Multi-session soak and load test for flet-stack.
+
+Runs many AppModel instances against stub pages on a single event loop and
+drives navigation through route_change and view_popped. on_load handlers
+simulate I/O latency (asyncio.sleep) and CPU work (busy loop), so head-of-line
+blocking shows up as event-loop lag and inflated navigation latency.
+
+Usage:
+    python benchmarks/soak.py --sessions 200 --duration 60
+    python benchmarks/soak.py --sessions 50 --script "/,/items/1,/report,back,back"
+
+Reported periodically and at the end:
+    - p50/p99 navigation latency (route_change until on_load has finished),
+      split into navigations that ran on_load, ones that did not (already
+      loaded or no on_load) and back navigations
+    - event-loop lag (how late a periodic timer fires)
+    - on_load tasks in flight
+    - mean navigation stack depth and loaded routes held by all sessions
+    - RSS and its growth since start
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Set, Tuple
+
+import flet as ft
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from flet_stack.router import AppModel, render_view_for_route, view  # noqa: E402
+
+# Load profile, set from the command line before sessions start
+PROFILE = SimpleNamespace(io_ms=20.0, cpu_ms=2.0, item_count=1000)
+
+
+# --- Simulated views ---
+
+def simulated_io():
+    """Sleep for a jittered amount of time around the configured I/O latency."""
+    return asyncio.sleep(random.expovariate(1.0 / PROFILE.io_ms) / 1000 if PROFILE.io_ms else 0)
+
+
+def simulated_cpu():
+    """Busy-loop for the configured amount of CPU time, blocking the event loop."""
+    deadline = time.perf_counter() + PROFILE.cpu_ms / 1000
+    while time.perf_counter() < deadline:
+        pass
+
+
+class ItemState:
+    item = None
+
+
+async def load_item(state, item_id):
+    await simulated_io()
+    state.item = {"id": item_id, "name": f"Item {item_id}"}
+
+
+class ReportState:
+    rows = None
+
+
+async def load_report(state, view):
+    await simulated_io()
+    simulated_cpu()
+    state.rows = list(range(100))
+    view.bgcolor = ft.Colors.GREY_100
+
+
+def load_settings(state):
+    simulated_cpu()
+
+
+class SettingsState:
+    theme = "light"
+
+
+@view("/")
+def home_view():
+    return [ft.Text("Home")]
+
+
+@view("/items/{item_id:int}", state_class=ItemState, on_load=load_item)
+def item_view(state, item_id):
+    return [ft.Text(state.item["name"])]
+
+
+@view("/report", state_class=ReportState, on_load=load_report)
+def report_view(state):
+    return [ft.Text(f"{len(state.rows)} rows")]
+
+
+@view("/settings", state_class=SettingsState, on_load=load_settings)
+def settings_view(state):
+    return [ft.Text(state.theme)]
+
+
+# --- Stub page ---
+
+class StubPage:
+    """Minimal stand-in for ft.Page that dispatches route events like the real client."""
+
+    def __init__(self, route: str = "/"):
+        self.route = route
+        self.on_route_change = None
+        self.on_view_pop = None
+
+    async def push_route(self, route: str):
+        self.route = route
+        if self.on_route_change:
+            self.on_route_change(SimpleNamespace(route=route, page=self))
+
+
+# --- Sessions ---
+
+class Session:
+    """One simulated user: an AppModel bound to its own StubPage."""
+
+    def __init__(self, stats: "Stats", render: bool):
+        self.page = StubPage()
+        self.app = AppModel(page=self.page)
+        self.page.on_route_change = self.app.route_change
+        self.page.on_view_pop = self.app.view_popped
+        self.stats = stats
+        self.render = render
+
+    async def start(self):
+        started = time.perf_counter()
+        loaded = len(self.app.loaded_routes)
+        await self._timed(self.app.initialize_with_route(self.page.route), started, loaded)
+
+    async def navigate(self, route: str):
+        started = time.perf_counter()
+        loaded = len(self.app.loaded_routes)
+        self.page.route = route
+        depth = len(self.app.routes)
+        task = self.app.route_change(SimpleNamespace(route=route, page=self.page))
+        if task is None and len(self.app.routes) == depth:
+            # Same route as the top of the stack: route_change ignored it, nothing navigated
+            self.stats.noops += 1
+            return
+        await self._timed(task, started, loaded)
+
+    async def back(self):
+        if len(self.app.routes) > 1:
+            started = time.perf_counter()
+            await self.app.view_popped(SimpleNamespace(view=None, page=self.page))
+            await self._timed(None, started, None)
+
+    async def _timed(self, task: Optional[asyncio.Task], started: float, loaded: Optional[int]):
+        if task is not None:
+            self.stats.track(task)
+            await task
+        if self.render:
+            for route in self.app.routes:
+                render_view_for_route(route, self.app)
+
+        # Each session navigates sequentially, so growth of loaded_routes means on_load ran
+        if loaded is None:
+            kind = "back"
+        elif len(self.app.loaded_routes) > loaded:
+            kind = "load"
+        else:
+            kind = "cached"
+        self.stats.latencies[kind].append(time.perf_counter() - started)
+        self.stats.navigations += 1
+
+
+def random_route() -> str:
+    choice = random.random()
+    if choice < 0.6:
+        return f"/items/{random.randrange(PROFILE.item_count)}"
+    if choice < 0.8:
+        return "/report"
+    if choice < 0.9:
+        return "/settings"
+    return "/"
+
+
+async def run_session(session: Session, script: Optional[List[str]], think_ms: float,
+                      back_probability: float, max_depth: int, stop_at: float):
+    await session.start()
+    step = 0
+    while time.perf_counter() < stop_at:
+        if len(session.app.routes) >= max_depth:
+            # Keep the stack bounded so the harness itself does not grow over time
+            action = "back"
+        elif script:
+            action = script[step % len(script)]
+            step += 1
+        elif random.random() < back_probability:
+            action = "back"
+        else:
+            action = random_route()
+
+        if action == "back":
+            await session.back()
+        else:
+            await session.navigate(action)
+
+        if think_ms:
+            await asyncio.sleep(random.uniform(0, 2 * think_ms) / 1000)
+
+
+# --- Metrics ---
+
+NAVIGATION_KINDS = ("load", "cached", "back")
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {kind: [] for kind in NAVIGATION_KINDS}
+        self.navigations = 0
+        # Forward steps to the route already on top of the stack
+        self.noops = 0
+        self.loop_lag: List[float] = []
+        # on_load tasks scheduled by route_change/initialize_with_route that have not finished
+        self.in_flight: Set[asyncio.Task] = set()
+        # Samples already reported in a window
+        self.all_latencies: Dict[str, List[float]] = {kind: [] for kind in NAVIGATION_KINDS}
+        self.all_lag: List[float] = []
+
+    def track(self, task: asyncio.Task):
+        self.in_flight.add(task)
+        task.add_done_callback(self.in_flight.discard)
+
+    def take_window(self) -> Tuple[Dict[str, List[float]], List[float]]:
+        """Return samples since the last window and move them to the totals."""
+        window, self.latencies = self.latencies, {kind: [] for kind in NAVIGATION_KINDS}
+        lag, self.loop_lag = self.loop_lag, []
+        for kind in NAVIGATION_KINDS:
+            self.all_latencies[kind].extend(window[kind])
+        self.all_lag.extend(lag)
+        return window, lag
+
+
+def rss_bytes() -> int:
+    """Current resident set size, falling back to peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def monitor_loop_lag(stats: Stats, interval: float, stop_at: float):
+    """Measure how late a fixed-interval timer wakes up."""
+    while time.perf_counter() < stop_at:
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        stats.loop_lag.append(max(0.0, time.perf_counter() - expected))
+
+
+def ms(values: List[float], pct: float) -> str:
+    if not values:
+        return "-"
+    return f"{percentile(values, pct) * 1000:.2f}"
+
+
+async def report(
+    stats: Stats, sessions: List[Session], every: float, stop_at: float, rss_start: int
+):
+    """Print one line per window so leaks and drift are visible over time."""
+    started = time.perf_counter()
+    print(f"{'t(s)':>6} {'navs':>7} {'load p50/p99':>15} {'cached p50/p99':>15} "
+          f"{'back p50/p99':>15} {'lag p99':>8} {'loads':>6} {'depth':>6} {'cached':>8} "
+          f"{'rss(MB)':>8} {'+rss(MB)':>8}")
+    while True:
+        remaining = stop_at - time.perf_counter()
+        if remaining <= 0:
+            break
+        await asyncio.sleep(min(every, remaining))
+        window, lag = stats.take_window()
+        rss = rss_bytes()
+        cached = sum(len(s.app.loaded_routes) for s in sessions)
+        depth = statistics.mean(len(s.app.routes) for s in sessions)
+        columns = [f"{ms(window[kind], 50)}/{ms(window[kind], 99)}" for kind in NAVIGATION_KINDS]
+        print(f"{time.perf_counter() - started:6.1f} {sum(map(len, window.values())):7d} "
+              f"{columns[0]:>15} {columns[1]:>15} {columns[2]:>15} "
+              f"{ms(lag, 99):>8} {len(stats.in_flight):6d} {depth:6.1f} {cached:8d} "
+              f"{rss / 2**20:8.1f} {(rss - rss_start) / 2**20:8.1f}")
+
+
+async def main(args):
+    PROFILE.io_ms = args.io_ms
+    PROFILE.cpu_ms = args.cpu_ms
+    PROFILE.item_count = args.items
+    random.seed(args.seed)
+
+    script = [s.strip() for s in args.script.split(",") if s.strip()] if args.script else None
+    if script and script.count("back") < len(script) - script.count("back"):
+        print(f"warning: script pushes more routes than it pops; "
+              f"stacks will be capped at --max-depth {args.max_depth}")
+    stats = Stats()
+    sessions = [Session(stats, render=args.render) for _ in range(args.sessions)]
+
+    rss_start = rss_bytes()
+    wall_start = time.perf_counter()
+    stop_at = wall_start + args.duration
+
+    monitor = asyncio.create_task(monitor_loop_lag(stats, args.lag_interval / 1000, stop_at))
+    reporter = asyncio.create_task(report(stats, sessions, args.report_every, stop_at, rss_start))
+    await asyncio.gather(
+        *(run_session(s, script, args.think_ms, args.back_probability, args.max_depth, stop_at)
+          for s in sessions),
+    )
+    elapsed = time.perf_counter() - wall_start
+    await asyncio.gather(monitor, reporter)
+
+    stats.take_window()
+    latencies = stats.all_latencies
+    lag = stats.all_lag
+    rss_end = rss_bytes()
+    print()
+    print(f"sessions:         {args.sessions}")
+    print(f"navigations:      {stats.navigations} ({stats.navigations / elapsed:.0f}/s)")
+    print(f"skipped (no-op):  {stats.noops}")
+    for kind in NAVIGATION_KINDS:
+        values = latencies[kind]
+        if values:
+            print(f"{kind + ' p50/p99/max:':<20}{ms(values, 50)} / {ms(values, 99)} / "
+                  f"{max(values) * 1000:.2f} ms ({len(values)} navigations)")
+    if lag:
+        print(f"loop lag mean/p99/max: {statistics.mean(lag) * 1000:.2f} / "
+              f"{ms(lag, 99)} / {max(lag) * 1000:.2f} ms")
+    print(f"mean stack depth: {statistics.mean(len(s.app.routes) for s in sessions):.1f}")
+    print(f"rss start/end:    {rss_start / 2**20:.1f} / {rss_end / 2**20:.1f} MB "
+          f"(+{(rss_end - rss_start) / 2**20:.1f} MB)")
+    print(f"per session:      {(rss_end - rss_start) / max(1, args.sessions) / 1024:.1f} KB")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Soak/load test flet-stack with simulated sessions."
+    )
+    parser.add_argument("--sessions", type=int, default=100,
+                        help="Concurrent sessions (default: 100)")
+    parser.add_argument("--duration", type=float, default=30.0,
+                        help="Run time in seconds (default: 30)")
+    parser.add_argument("--script",
+                        help="Comma-separated routes to cycle through, 'back' pops the stack")
+    parser.add_argument("--back-probability", type=float, default=0.3,
+                        help="Chance of going back in random mode (default: 0.3)")
+    parser.add_argument("--max-depth", type=int, default=8,
+                        help="Always go back once the stack is this deep (default: 8)")
+    parser.add_argument("--think-ms", type=float, default=50.0,
+                        help="Mean pause between actions (default: 50)")
+    parser.add_argument("--io-ms", type=float, default=20.0,
+                        help="Mean simulated I/O per on_load (default: 20)")
+    parser.add_argument("--cpu-ms", type=float, default=2.0,
+                        help="Simulated CPU per CPU-bound on_load (default: 2)")
+    parser.add_argument("--items", type=int, default=1000,
+                        help="Distinct /items/{item_id} values (default: 1000)")
+    parser.add_argument("--render", action="store_true",
+                        help="Also build ft.View objects after each navigation")
+    parser.add_argument("--lag-interval", type=float, default=10.0,
+                        help="Loop lag probe interval in ms (default: 10)")
+    parser.add_argument("--report-every", type=float, default=5.0,
+                        help="Seconds between report lines (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
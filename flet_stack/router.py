@@ -1,24 +1,150 @@
 import asyncio
 import inspect
+import re
 from dataclasses import dataclass, field
-from typing import Callable, Type, Optional, Dict, List
+from functools import lru_cache
+from typing import Any, Callable, Type, Optional, Dict, List, Tuple
+from urllib.parse import parse_qsl, unquote
 import flet as ft
 
 # Registry to store view configurations
 _VIEW_REGISTRY: Dict[str, dict] = {}
 
+# Converters available in route patterns: name -> (regex, conversion function)
+_CONVERTERS: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    'str': (r'[^/]+', str),
+    'int': (r'-?[0-9]+', int),
+    'float': (r'-?[0-9]+(?:\.[0-9]+)?', float),
+    'path': (r'.+', str),
+}
+
+# Query values are not path segments, so 'str' and 'path' may contain slashes
+_QUERY_CONVERTERS: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    **_CONVERTERS,
+    'str': (r'.+', str),
+}
+
+# Names flet-stack itself passes to on_load functions
+_ON_LOAD_ARGS = {'state', 'page', 'view'}
+
+_PARAM_PATTERN = re.compile(r'\{(\w+)(?::(\w+))?\}')
+
+
+def _get_converter(
+    pattern: str,
+    converter_name: Optional[str],
+    converters: Dict[str, Tuple[str, Callable[[str], Any]]],
+) -> Tuple[str, Callable[[str], Any]]:
+    """Look up a converter by name, defaulting to 'str'."""
+    converter_name = converter_name or 'str'
+    if converter_name not in converters:
+        raise ValueError(f"Unknown converter '{converter_name}' in route '{pattern}'")
+    return converters[converter_name]
+
+
+def _check_param_name(pattern: str, name: str, seen: set):
+    """Reject repeated parameter names."""
+    if name in seen:
+        raise ValueError(f"Duplicate parameter name '{name}' in route '{pattern}'")
+    seen.add(name)
+
+
+@lru_cache(maxsize=None)
+def compile_route(pattern: str) -> dict:
+    """
+    Compile a route pattern into a regex and its parameter converters.
+
+    Path parameters are written as {name} or {name:type}, where type is one of
+    'str' (default), 'int', 'float' or 'path' (matches the rest of the path,
+    including slashes). Query parameters can be declared after '?', separated
+    by '&' (e.g., '/products?{page:int}&{sort}'); they are optional.
+
+    Compiled patterns are cached; the returned dict must not be modified.
+
+    Args:
+        pattern: Route pattern like '/user/{user_id:int}'
+
+    Returns:
+        Dictionary with 'regex', 'converters' and 'query_converters'
+
+    Raises:
+        ValueError: If the pattern uses an unknown converter, a repeated parameter name,
+                    or a malformed parameter or query declaration
+    """
+    path_pattern, _, query_pattern = pattern.partition('?')
+    seen = set()
+
+    regex_parts = []
+    literals = []
+    converters = {}
+    last_end = 0
+    for match in _PARAM_PATTERN.finditer(path_pattern):
+        name, converter_name = match.groups()
+        _check_param_name(pattern, name, seen)
+        regex, func = _get_converter(pattern, converter_name, _CONVERTERS)
+        literals.append(path_pattern[last_end:match.start()])
+        regex_parts.append(re.escape(literals[-1]))
+        regex_parts.append(f'(?P<{name}>{regex})')
+        converters[name] = func
+        last_end = match.end()
+    literals.append(path_pattern[last_end:])
+    regex_parts.append(re.escape(literals[-1]))
+
+    # Braces left over in literal text are placeholders that did not parse (e.g. '{user-id}')
+    if any('{' in literal or '}' in literal for literal in literals):
+        raise ValueError(f"Invalid path parameter in route '{pattern}'")
+
+    query_converters = {}
+    for part in filter(None, query_pattern.split('&')):
+        match = _PARAM_PATTERN.fullmatch(part)
+        if not match:
+            raise ValueError(f"Invalid query parameter '{part}' in route '{pattern}'")
+        name, converter_name = match.groups()
+        _check_param_name(pattern, name, seen)
+        regex, func = _get_converter(pattern, converter_name, _QUERY_CONVERTERS)
+        query_converters[name] = (re.compile(regex), func)
+
+    return {
+        'regex': re.compile(''.join(regex_parts)),
+        'converters': converters,
+        'query_converters': query_converters,
+    }
+
+
+def _check_arg_collisions(route: str, compiled: dict, state_class: Type,
+                          on_load: Optional[Callable]):
+    """
+    Reject URL parameters that would clash with arguments flet-stack passes itself.
+
+    The view function receives state positionally when state_class is set, and
+    on_load receives state, page and view by name when its signature asks for them.
+    """
+    names = set(compiled['converters']) | set(compiled['query_converters'])
+    if state_class is not None and 'state' in names:
+        raise ValueError(f"Parameter 'state' clashes with state_class in route '{route}'")
+    if on_load is not None:
+        on_load_args = set(inspect.signature(on_load).parameters)
+        clashes = sorted(names & on_load_args & _ON_LOAD_ARGS)
+        if clashes:
+            raise ValueError(
+                f"Parameter '{clashes[0]}' clashes with on_load argument in route '{route}'"
+            )
+
 
 def view(route: str, state_class: Type = None, on_load: Optional[Callable] = None, **view_kwargs):
     """
     Decorator to register a view with its route, state class, on_load handler, and view properties.
 
     Args:
-        route: The route path for this view (e.g., '/', '/store', '/user/{user_id}')
+        route: The route path for this view (e.g., '/', '/store', '/user/{user_id:int}',
+               '/products?{page:int}')
         state_class: Optional dataclass for view-specific state (should be decorated with @ft.observable)
         on_load: Optional function to call before rendering the view (can be async).
                  Function can accept: state, page, view, and any URL parameters
         **view_kwargs: Additional keyword arguments to pass to ft.View (e.g., appbar, bgcolor, padding)
     """
+    compiled = compile_route(route)
+    _check_arg_collisions(route, compiled, state_class, on_load)
 
     def decorator(func: Callable):
         _VIEW_REGISTRY[route] = {
@@ -26,39 +152,81 @@ def view(route: str, state_class: Type = None, on_load: Optional[Callable] = Non
             'state_class': state_class,
             'on_load': on_load,
             'view_kwargs': view_kwargs,
-            'route': route
+            'route': route,
+            **compiled
         }
+        # Registered routes changed, drop previously resolved paths
+        resolve_route.cache_clear()
         return func
 
     return decorator
 
 
-def match_route(pattern: str, path: str) -> Optional[Dict[str, str]]:
+def _match_compiled(compiled: dict, path: str, query: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Match a path and parsed query string against a compiled route."""
+    match = compiled['regex'].fullmatch(path)
+    if match is None:
+        return None
+
+    params = {}
+    try:
+        for name, value in match.groupdict().items():
+            # Decode path captures like parse_qsl decodes query values
+            params[name] = compiled['converters'][name](unquote(value))
+        for name, (regex, func) in compiled['query_converters'].items():
+            if name in query:
+                if not regex.fullmatch(query[name]):
+                    return None
+                params[name] = func(query[name])
+    except ValueError:
+        return None
+
+    return params
+
+
+def match_route(pattern: str, path: str) -> Optional[Dict[str, Any]]:
     """
     Match a route pattern against a path and extract parameters.
 
     Args:
-        pattern: Route pattern like '/user/{user_id}'
-        path: Actual path like '/user/123'
+        pattern: Route pattern like '/user/{user_id:int}'
+        path: Actual path like '/user/123', optionally with a query string
 
     Returns:
-        Dictionary of parameters if matched, None otherwise
+        Dictionary of converted, percent-decoded parameters if matched, None otherwise
     """
-    pattern_parts = pattern.split('/')
-    path_parts = path.split('/')
+    compiled = compile_route(pattern)
+    path, _, query_string = path.partition('?')
+    return _match_compiled(compiled, path, dict(parse_qsl(query_string)))
 
-    if len(pattern_parts) != len(path_parts):
-        return None
 
-    params = {}
-    for pattern_part, path_part in zip(pattern_parts, path_parts):
-        if pattern_part.startswith('{') and pattern_part.endswith('}'):
-            param_name = pattern_part[1:-1]
-            params[param_name] = path_part
-        elif pattern_part != path_part:
-            return None
+@lru_cache(maxsize=1024)
+def resolve_route(route: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Resolve a route to its registered pattern and converted parameters.
 
-    return params
+    Results are cached per route string; the cache is cleared whenever a view is registered.
+    The returned params dict is shared between callers and must not be modified.
+
+    Returns:
+        Tuple of (route_pattern, params_dict) if found, None otherwise
+    """
+    path, _, query_string = route.partition('?')
+    query = dict(parse_qsl(query_string))
+
+    # Try exact match first
+    config = _VIEW_REGISTRY.get(path)
+    if config and not config['converters']:
+        params = _match_compiled(config, path, query)
+        if params is not None:
+            return (config['route'], params)
+
+    # Try pattern matching
+    for route_pattern, config in _VIEW_REGISTRY.items():
+        params = _match_compiled(config, path, query)
+        if params is not None:
+            return (route_pattern, params)
+    return None
 
 
 def find_matching_route(path: str) -> Optional[tuple]:
@@ -68,14 +236,10 @@ def find_matching_route(path: str) -> Optional[tuple]:
     Returns:
         Tuple of (route_pattern, params_dict) if found, None otherwise
     """
-    for route_pattern in _VIEW_REGISTRY.keys():
-        params = match_route(route_pattern, path)
-        if params is not None:
-            return (route_pattern, params)
-    return None
+    return resolve_route(path)
 
 
-def get_route_key(route: str, params: Dict[str, str]) -> str:
+def get_route_key(route: str, params: Dict[str, Any]) -> str:
     """Generate a unique key for a route with its parameters."""
     if not params:
         return route
@@ -101,7 +265,7 @@ class ViewProxy:
         return self._view_kwargs.get(name)
 
 
-async def call_on_load(on_load_func: Callable, state, page, view_proxy: ViewProxy, params: Dict[str, str]):
+async def call_on_load(on_load_func: Callable, state, page, view_proxy: ViewProxy, params: Dict[str, Any]):
     """
     Call the on_load function with appropriate parameters based on its signature.
 
@@ -148,6 +312,7 @@ class AppModel:
         loaded_routes: Set of routes that have completed their on_load
         loading_counter: Counter to track loading operations
         initialized: Flag to track if initial route has been set
+        page: Optional page to use instead of ft.context.page (e.g. for headless sessions)
     """
     routes: List[str] = field(default_factory=list)
     view_states: Dict[str, any] = field(default_factory=dict)
@@ -155,46 +320,61 @@ class AppModel:
     loaded_routes: set = field(default_factory=set)
     loading_counter: int = 0
     initialized: bool = False
+    page: Optional[Any] = None
+
+    def get_page(self):
+        """Return the page bound to this model, falling back to ft.context.page."""
+        if self.page is not None:
+            return self.page
+        return ft.context.page
 
-    def initialize_with_route(self, initial_route: str):
-        """Initialize the app with a specific route."""
+    def initialize_with_route(self, initial_route: str) -> Optional[asyncio.Task]:
+        """
+        Initialize the app with a specific route.
+
+        Returns:
+            The task running the initial on_load, or None if already initialized
+        """
         if not self.initialized:
             self.routes = [initial_route]
             self.initialized = True
             # Trigger initial on_load
-            asyncio.create_task(self.handle_on_load(initial_route))
+            return asyncio.create_task(self.handle_on_load(initial_route))
+        return None
 
-    def route_change(self, e: ft.RouteChangeEvent):
-        """Handle route changes by maintaining a navigation stack."""
+    def route_change(self, e: ft.RouteChangeEvent) -> Optional[asyncio.Task]:
+        """
+        Handle route changes by maintaining a navigation stack.
+
+        Returns:
+            The task running on_load for the new route, or None if nothing was scheduled
+        """
         new_route = e.route
 
         # If not initialized yet, initialize with this route
         if not self.initialized:
-            self.initialize_with_route(new_route)
-            return
+            return self.initialize_with_route(new_route)
 
         # Prevent adding duplicate consecutive routes
         if self.routes and self.routes[-1] == new_route:
-            return
+            return None
 
         # Append new route to the stack
         self.routes.append(new_route)
 
         # Handle on_load for the new route
-        asyncio.create_task(self.handle_on_load(new_route))
+        return asyncio.create_task(self.handle_on_load(new_route))
 
     async def handle_on_load(self, route: str):
         """Handle on_load for the current route."""
         config = None
         params = {}
 
-        if route in _VIEW_REGISTRY:
-            config = _VIEW_REGISTRY[route]
-        else:
-            match_result = find_matching_route(route)
-            if match_result:
-                route_pattern, params = match_result
-                config = _VIEW_REGISTRY[route_pattern]
+        # Invalid paths (e.g. a non-integer for an int parameter) resolve to None and never load
+        match_result = resolve_route(route)
+        if match_result:
+            route_pattern, params = match_result
+            config = _VIEW_REGISTRY[route_pattern]
 
         if config:
             route_key = get_route_key(config['route'], params)
@@ -202,7 +382,7 @@ class AppModel:
             # Only call on_load if it hasn't been called for this route instance
             if route_key not in self.loaded_routes and config.get('on_load'):
                 state = self.get_or_create_state(config['route'], config['state_class'])
-                page = ft.context.page
+                page = self.get_page()
 
                 # Create a copy of view_kwargs for this route instance
                 view_kwargs = config['view_kwargs'].copy()
@@ -224,7 +404,7 @@ class AppModel:
 
             # Navigate to the new top of the stack
             new_route = self.routes[-1]
-            await ft.context.page.push_route(new_route)
+            await self.get_page().push_route(new_route)
 
     def get_or_create_state(self, route: str, state_class: Type):
         """Get existing state or create new one for a route."""
@@ -256,15 +436,10 @@ def render_view_for_route(route: str, app: AppModel) -> ft.View:
     config = None
     params = {}
 
-    # Try exact match first
-    if route in _VIEW_REGISTRY:
-        config = _VIEW_REGISTRY[route]
-    else:
-        # Try pattern matching
-        match_result = find_matching_route(route)
-        if match_result:
-            route_pattern, params = match_result
-            config = _VIEW_REGISTRY[route_pattern]
+    match_result = resolve_route(route)
+    if match_result:
+        route_pattern, params = match_result
+        config = _VIEW_REGISTRY[route_pattern]
 
     if not config:
         # No matching route found, show 404
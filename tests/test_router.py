@@ -0,0 +1,181 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("flet")
+
+from flet_stack import router  # noqa: E402
+from flet_stack.router import (  # noqa: E402
+    AppModel,
+    compile_route,
+    match_route,
+    resolve_route,
+    view,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    saved = dict(router._VIEW_REGISTRY)
+    router._VIEW_REGISTRY.clear()
+    resolve_route.cache_clear()
+    yield
+    router._VIEW_REGISTRY.clear()
+    router._VIEW_REGISTRY.update(saved)
+    resolve_route.cache_clear()
+
+
+def noop(**kwargs):
+    return []
+
+
+def test_int_conversion():
+    view("/user/{user_id:int}")(noop)
+    assert resolve_route("/user/42") == ("/user/{user_id:int}", {"user_id": 42})
+    assert resolve_route("/user/-3") == ("/user/{user_id:int}", {"user_id": -3})
+    assert resolve_route("/user/abc") is None
+    assert resolve_route("/user/") is None
+
+
+def test_float_conversion():
+    view("/price/{amount:float}")(noop)
+    assert resolve_route("/price/9.5") == ("/price/{amount:float}", {"amount": 9.5})
+    assert resolve_route("/price/3") == ("/price/{amount:float}", {"amount": 3.0})
+    assert resolve_route("/price/1e3") is None
+
+
+def test_path_conversion():
+    view("/files/{rest:path}")(noop)
+    assert resolve_route("/files/a/b/c.txt") == ("/files/{rest:path}", {"rest": "a/b/c.txt"})
+    assert resolve_route("/files/") is None
+
+
+def test_str_does_not_cross_segments():
+    view("/tag/{slug}")(noop)
+    assert resolve_route("/tag/python") == ("/tag/{slug}", {"slug": "python"})
+    assert resolve_route("/tag/a/b") is None
+
+
+def test_static_route_wins_over_pattern():
+    view("/user/{user_id}")(noop)
+    view("/user/new")(noop)
+    assert resolve_route("/user/new") == ("/user/new", {})
+
+
+def test_invalid_path_never_calls_on_load():
+    calls = []
+
+    def load(user_id):
+        calls.append(user_id)
+
+    view("/user/{user_id:int}", on_load=load)(noop)
+    app = AppModel(page=object())
+
+    asyncio.run(app.handle_on_load("/user/abc"))
+    assert calls == []
+    assert not app.loaded_routes
+
+    asyncio.run(app.handle_on_load("/user/7"))
+    assert calls == [7]
+
+
+def test_query_params_absent():
+    view("/products?{p:int}&{sort}")(noop)
+    assert resolve_route("/products") == ("/products?{p:int}&{sort}", {})
+
+
+def test_query_params_converted():
+    view("/products?{p:int}&{sort}")(noop)
+    assert resolve_route("/products?p=2&sort=price") == (
+        "/products?{p:int}&{sort}",
+        {"p": 2, "sort": "price"},
+    )
+
+
+def test_query_params_invalid():
+    view("/products?{p:int}")(noop)
+    assert resolve_route("/products?p=two") is None
+
+
+def test_query_params_undeclared_ignored():
+    view("/products?{p:int}")(noop)
+    view("/about")(noop)
+    assert resolve_route("/products?p=2&utm=x") == ("/products?{p:int}", {"p": 2})
+    assert resolve_route("/about?utm=x") == ("/about", {})
+
+
+def test_query_str_allows_slashes():
+    view("/search?{q}")(noop)
+    assert resolve_route("/search?q=a/b") == ("/search?{q}", {"q": "a/b"})
+    assert resolve_route("/search?q=a%2Fb") == ("/search?{q}", {"q": "a/b"})
+
+
+def test_unknown_converter_raises():
+    with pytest.raises(ValueError, match="Unknown converter 'bogus'"):
+        compile_route("/x/{a:bogus}")
+    with pytest.raises(ValueError, match="Unknown converter 'bogus'"):
+        compile_route("/x?{a:bogus}")
+
+
+def test_plain_view_may_use_page_view_state_names():
+    view("/products?{page:int}")(noop)
+    view("/blog/{view}/{state}")(noop)
+    assert resolve_route("/products?page=2") == ("/products?{page:int}", {"page": 2})
+    assert resolve_route("/blog/a/b") == ("/blog/{view}/{state}", {"view": "a", "state": "b"})
+
+
+def test_state_param_with_state_class_raises():
+    with pytest.raises(ValueError, match="Parameter 'state' clashes with state_class"):
+        view("/x/{state}", state_class=dict)
+
+
+@pytest.mark.parametrize("name", ["state", "page", "view"])
+def test_param_clashing_with_on_load_arg_raises(name):
+    on_load = eval(f"lambda {name}: None")
+    with pytest.raises(ValueError, match=f"Parameter '{name}' clashes with on_load"):
+        view(f"/x?{{{name}:int}}", on_load=on_load)
+
+
+def test_param_not_requested_by_on_load_is_allowed():
+    view("/x/{page:int}", on_load=lambda state: None)(noop)
+    assert resolve_route("/x/3") == ("/x/{page:int}", {"page": 3})
+
+
+@pytest.mark.parametrize("pattern", ["/x/{user-id}", "/x/{a:}", "/x/{a b}", "/x/{a", "/x/a}"])
+def test_malformed_placeholder_raises(pattern):
+    with pytest.raises(ValueError, match="Invalid path parameter"):
+        compile_route(pattern)
+
+
+def test_path_params_are_percent_decoded():
+    view("/tag/{slug}")(noop)
+    assert resolve_route("/tag/a%2Fb") == ("/tag/{slug}", {"slug": "a/b"})
+    assert resolve_route("/tag/hello%20world") == ("/tag/{slug}", {"slug": "hello world"})
+
+
+def test_non_ascii_digits_rejected():
+    view("/a/{n:int}")(noop)
+    view("/b/{x:float}")(noop)
+    assert resolve_route("/a/\u0661\u0662") is None
+    assert resolve_route("/b/\u0661.5") is None
+
+
+def test_match_route_caches_compiled_pattern():
+    compile_route.cache_clear()
+    assert match_route("/m/{n:int}", "/m/1") == {"n": 1}
+    assert match_route("/m/{n:int}", "/m/2") == {"n": 2}
+    assert compile_route.cache_info().hits >= 1
+
+
+def test_duplicate_name_raises():
+    with pytest.raises(ValueError, match="Duplicate parameter name 'a'"):
+        compile_route("/x/{a}/{a}")
+    with pytest.raises(ValueError, match="Duplicate parameter name 'a'"):
+        compile_route("/x/{a}?{a:int}")
+
+
+def test_registration_clears_resolve_cache():
+    assert resolve_route("/late/1") is None
+    view("/late/{item_id:int}")(noop)
+    assert resolve_route("/late/1") == ("/late/{item_id:int}", {"item_id": 1})
+    assert resolve_route.cache_info().currsize == 1